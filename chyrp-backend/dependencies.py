@@ -7,7 +7,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 import os
 from dotenv import load_dotenv
 import models
@@ -92,14 +92,18 @@ def require_permission(required_permissions: List[str]):
                 )
     return permission_checker
 
-def require_post_permission(perm_any: str, perm_own: str):
+def require_post_permission(perm_any: str, perm_own: str, defer_body: bool = False):
     """
     Dependency factory to check for post-related permissions.
     Checks if user has the 'perm_any' or if they are the owner and have 'perm_own'.
+    With defer_body=True the post body is not loaded (for endpoints that never read it).
     """
     def checker(post_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
         # Get the post from the database
-        db_post = db.query(models.Post).filter(models.Post.id == post_id).first()
+        query = db.query(models.Post)
+        if defer_body:
+            query = query.options(defer(models.Post.body))
+        db_post = query.filter(models.Post.id == post_id).first()
         if db_post is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
             
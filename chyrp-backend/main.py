@@ -13,7 +13,9 @@ from uuid import uuid4
 from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import String, func, literal, update
 from sqlalchemy.orm import Session
+from pydantic import ValidationError
 
 # --- Import from our custom files ---
 import models
@@ -28,7 +30,8 @@ from dependencies import (
     require_permission,      # <-- ADD THIS IMPORT
     require_post_permission  # <-- EXISTING IMPORT
 )
-from routers import interactions
+from routers import interactions, discovery
+import upgrade_db
 
 # ===============================================================================
 # 1. FASTAPI APP INITIALIZATION & MIDDLEWARE
@@ -60,9 +63,11 @@ app.add_middleware(
 
 # --- Include Routers from other files ---
 app.include_router(interactions.router)
+app.include_router(discovery.router)
 
 # --- Create Database Tables on Startup ---
 models.Base.metadata.create_all(bind=engine)
+upgrade_db.upgrade(engine)
 
 # ===============================================================================
 # 2. STARTUP EVENT (DATABASE SEEDING)
@@ -198,10 +203,94 @@ def update_post(
         setattr(db_post, key, value)
     
     db_post.updated_at = datetime.datetime.utcnow()
+    db_post.version = models.Post.version + 1
     db.commit()
     db.refresh(db_post)
     return db_post
 
+# Fields that PostModel allows to be null; the rest must always hold a value.
+NULLABLE_POST_FIELDS = {"title", "body", "feather", "parent_id"}
+
+def _spliced_body(edits: List[schemas.TextEdit]):
+    """
+    Builds a SQL expression that applies non-overlapping text edits to the
+    stored body, so the new body never has to be sent or loaded in full.
+    """
+    body = func.coalesce(models.Post.body, "")
+    expr = None
+    position = 0
+    for edit in sorted(edits, key=lambda e: e.start):
+        if edit.start < position or edit.end < edit.start:
+            raise HTTPException(status_code=422, detail="Text edits must be ordered, non-overlapping ranges.")
+        piece = func.substr(body, position + 1, edit.start - position, type_=String) + literal(edit.text, String)
+        expr = piece if expr is None else expr + piece
+        position = edit.end
+    return expr + func.substr(body, position + 1, type_=String)
+
+@app.patch("/posts/{post_id}", response_model=schemas.PostVersion, tags=["Posts"])
+def patch_post(
+    post_id: int,
+    post_patch: schemas.PostPatch,
+    db: Session = Depends(get_db),
+    db_post: models.Post = Depends(require_post_permission("edit_post", "edit_own_post", defer_body=True))
+):
+    # Apply JSON Patch style field changes and/or body text edits in a single
+    # UPDATE ... WHERE version = ?, rejecting the request if someone else saved first.
+    changes = {}
+    for operation in post_patch.operations:
+        field = operation.path.lstrip("/")
+        if field not in schemas.PostUpdate.model_fields:
+            raise HTTPException(status_code=422, detail=f"Cannot patch path: {operation.path}")
+        if operation.op in ("add", "replace"):
+            changes[field] = operation.value
+        elif operation.op == "remove":
+            changes[field] = None
+        else:
+            raise HTTPException(status_code=422, detail=f"Unsupported patch operation: {operation.op}")
+        if changes[field] is None and field not in NULLABLE_POST_FIELDS:
+            raise HTTPException(status_code=422, detail=f"Cannot remove or null path: {operation.path}")
+    try:
+        values = schemas.PostUpdate(**changes).model_dump(include=set(changes))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    # Prevent duplicate slug (clean)
+    if "clean" in values:
+        existing = db.query(models.Post.id).filter(models.Post.clean == values["clean"], models.Post.id != post_id).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="A post with this slug already exists.")
+
+    query = update(models.Post).where(
+        models.Post.id == post_id,
+        models.Post.version == post_patch.version,
+    )
+    if post_patch.edits:
+        if "body" in values:
+            raise HTTPException(status_code=422, detail="Cannot combine body text edits with a body operation.")
+        values["body"] = _spliced_body(post_patch.edits)
+        max_end = max(edit.end for edit in post_patch.edits)
+        query = query.where(func.length(func.coalesce(models.Post.body, "")) >= max_end)
+
+    updated_at = datetime.datetime.utcnow()
+    values["updated_at"] = updated_at
+    values["version"] = models.Post.version + 1
+    result = db.execute(query.values(**values).execution_options(synchronize_session=False))
+
+    if result.rowcount == 0:
+        db.rollback()
+        current_version = db.query(models.Post.version).filter(models.Post.id == post_id).scalar()
+        if current_version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        if current_version != post_patch.version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Post has been modified (current version is {current_version}).",
+            )
+        raise HTTPException(status_code=422, detail="Text edit range is outside the current body.")
+
+    db.commit()
+    return {"id": post_id, "version": post_patch.version + 1, "updated_at": updated_at}
+
 @app.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Posts"])
 def delete_post(
     post_id: int,
@@ -210,6 +299,10 @@ def delete_post(
 ):
     # The dependency already verified permissions and fetched the post.
     # We can now safely delete it.
+    # SQLite ignores ON DELETE CASCADE, so drop its related-post rows explicitly.
+    db.query(models.PostSimilarity).filter(
+        (models.PostSimilarity.post_id == post_id) | (models.PostSimilarity.related_post_id == post_id)
+    ).delete(synchronize_session=False)
     db.delete(db_post)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,6 @@
 # models.py
 
-from sqlalchemy import (Column, DateTime, ForeignKey, Integer, String, Table, JSON, Boolean)  # Add Boolean import
+from sqlalchemy import (Column, DateTime, ForeignKey, Integer, String, Table, JSON, Boolean, Float)  # Add Boolean import
 from sqlalchemy.orm import relationship
 from database import Base
 import datetime
@@ -9,12 +9,14 @@ import datetime
 
 post_likes_association = Table('post_likes', Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True)
+    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True),
+    Column('created_at', DateTime, default=datetime.datetime.utcnow)
 )
 
 post_bookmarks_association = Table('post_bookmarks', Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
-    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True)
+    Column('post_id', Integer, ForeignKey('posts.id'), primary_key=True),
+    Column('created_at', DateTime, default=datetime.datetime.utcnow)
 )
 
 favorite_writers_association = Table('favorite_writers', Base.metadata,
@@ -76,11 +78,22 @@ class Post(Base):
     parent_id = Column(Integer, ForeignKey("posts.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+    version = Column(Integer, default=1, nullable=False)  # bumped on every edit, see PATCH /posts/{id}
     user_id = Column(Integer, ForeignKey("users.id"))
+    trending_score = Column(Float, nullable=True, index=True)  # log-space, see trending.py
+    trending_interactions = Column(Integer, default=0, nullable=False)  # likes/bookmarks in trending_score
     
     owner = relationship("User", back_populates="posts")
     parent = relationship("Post", remote_side=[id], back_populates="children")
     children = relationship("Post", back_populates="parent")
     
     liked_by_users = relationship("User", secondary=post_likes_association, back_populates="liked_posts")
-    bookmarked_by_users = relationship("User", secondary=post_bookmarks_association, back_populates="bookmarked_posts")
\ No newline at end of file
+    bookmarked_by_users = relationship("User", secondary=post_bookmarks_association, back_populates="bookmarked_posts")
+
+class PostSimilarity(Base):
+    """Precomputed item-to-item similarity, rebuilt by recommendations.py."""
+    __tablename__ = "post_similarities"
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"))
+    score = Column(Float)
\ No newline at end of file
@@ -0,0 +1,135 @@
+# recommendations.py
+#
+# Batch job that precomputes "related posts" from the post_likes table.
+# Run it periodically (e.g. from cron) with:  python recommendations.py
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal, engine
+
+TOP_K = 10
+CHUNK_SIZE = 512
+FETCH_SIZE = 10000
+INSERT_BATCH_SIZE = 5000
+
+
+def build_co_like_matrix(db: Session):
+    """
+    Builds a sparse binary user-by-post matrix from post_likes.
+    Returns the CSC matrix and the post ids that each column stands for.
+    """
+    likes = models.post_likes_association
+    n_likes = db.execute(select(func.count()).select_from(likes)).scalar()
+    if not n_likes:
+        return sp.csc_matrix((0, 0), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    # Stream the rows straight into preallocated buffers instead of holding
+    # the whole result set as Python objects.
+    users = np.empty(n_likes, dtype=np.int64)
+    posts = np.empty(n_likes, dtype=np.int64)
+    filled = 0
+    result = db.execute(
+        select(likes.c.user_id, likes.c.post_id).execution_options(yield_per=FETCH_SIZE)
+    )
+    for partition in result.partitions():
+        # Rows added after the count are left for the next rebuild.
+        partition = partition[:n_likes - filled]
+        for offset, (user_id, post_id) in enumerate(partition, start=filled):
+            users[offset] = user_id
+            posts[offset] = post_id
+        filled += len(partition)
+        if filled == n_likes:
+            break
+    result.close()
+    users, posts = users[:filled], posts[:filled]
+
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    post_ids, post_index = np.unique(posts, return_inverse=True)
+    data = np.ones(filled, dtype=np.float32)
+    matrix = sp.csc_matrix(
+        (data, (user_index, post_index)),
+        shape=(len(user_ids), len(post_ids)),
+    )
+    return matrix, post_ids
+
+
+def top_k_similar(matrix, top_k: int = TOP_K, chunk_size: int = CHUNK_SIZE):
+    """
+    Computes item-to-item cosine similarity between the columns of `matrix`
+    and yields (column, related_columns, scores) for every column, best first.
+
+    Only `chunk_size` rows of the similarity matrix are materialised at a
+    time, so peak memory is O(chunk_size * n_posts) instead of O(n_posts^2).
+    """
+    n_posts = matrix.shape[1]
+    if n_posts == 0:
+        return
+
+    # Column-normalise so that a plain dot product is the cosine similarity.
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    normalized = (matrix @ sp.diags(1.0 / norms)).tocsc()
+    normalized_t = normalized.T.tocsr()
+
+    k = min(top_k, n_posts - 1)
+    if k <= 0:
+        return
+
+    for start in range(0, n_posts, chunk_size):
+        end = min(start + chunk_size, n_posts)
+        block = (normalized_t[start:end] @ normalized).toarray()
+        # A post is never related to itself.
+        block[np.arange(end - start), np.arange(start, end)] = 0.0
+
+        candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for offset in range(end - start):
+            keep = candidate_scores[offset] > 0
+            yield start + offset, candidates[offset][keep], candidate_scores[offset][keep]
+
+
+def rebuild_related_posts(db: Session, top_k: int = TOP_K, chunk_size: int = CHUNK_SIZE) -> int:
+    """Replaces the contents of post_similarities. Returns the number of rows written."""
+    matrix, post_ids = build_co_like_matrix(db)
+    table = models.PostSimilarity.__table__
+
+    db.execute(table.delete())
+    written = 0
+    batch = []
+    for column, related, scores in top_k_similar(matrix, top_k, chunk_size):
+        post_id = int(post_ids[column])
+        for rank, (related_column, score) in enumerate(zip(related, scores)):
+            batch.append({
+                "post_id": post_id,
+                "rank": rank,
+                "related_post_id": int(post_ids[related_column]),
+                "score": float(score),
+            })
+        if len(batch) >= INSERT_BATCH_SIZE:
+            db.execute(insert(table), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(table), batch)
+        written += len(batch)
+
+    db.commit()
+    return written
+
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        count = rebuild_related_posts(db)
+        print(f"Stored {count} related-post rows.")
+    finally:
+        db.close()
@@ -0,0 +1,49 @@
+# routers/discovery.py
+
+import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+import schemas
+from models import Post, PostSimilarity
+from dependencies import get_db
+import trending
+
+router = APIRouter(
+    tags=["Discovery"],
+)
+
+@router.get("/posts/trending", response_model=List[schemas.TrendingPostModel])
+def read_trending_posts(content_type: str = "post", limit: int = 10, db: Session = Depends(get_db)):
+    """Returns the posts with the highest time-decayed like/bookmark score (see trending.py)."""
+    posts = (
+        db.query(Post)
+        .filter(Post.trending_score.isnot(None), Post.content_type == content_type)
+        .order_by(Post.trending_score.desc())
+        .limit(limit)
+        .all()
+    )
+    now = datetime.datetime.utcnow()
+    return [
+        schemas.TrendingPostModel(
+            **schemas.PostModel.model_validate(post).model_dump(),
+            score=trending.decayed_score(post, now),
+        )
+        for post in posts
+    ]
+
+@router.get("/posts/{post_id}/related", response_model=List[schemas.PostModel])
+def read_related_posts(post_id: int, limit: int = 10, db: Session = Depends(get_db)):
+    """Returns posts liked by the same readers, as precomputed by recommendations.py."""
+    if db.query(Post.id).filter(Post.id == post_id).first() is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return (
+        db.query(Post)
+        .join(PostSimilarity, PostSimilarity.related_post_id == Post.id)
+        .filter(PostSimilarity.post_id == post_id)
+        .order_by(PostSimilarity.rank)
+        .limit(limit)
+        .all()
+    )
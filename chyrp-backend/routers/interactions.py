@@ -1,12 +1,16 @@
 # routers/interactions.py
 
+import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 from dependencies import get_db, get_current_user, require_permission
 
 # --- Corrected Imports ---
 # Import models from the models.py file
-from models import User, Post
+from models import User, Post, post_likes_association, post_bookmarks_association
+import trending
 # Import dependencies
 from dependencies import get_db, get_current_user
 
@@ -14,33 +18,36 @@ router = APIRouter(
     tags=["Interactions"],
 )
 
+def _toggle_post_interaction(db: Session, table, post: Post, user: User, weight: float):
+    """Adds or removes the (user, post) row in `table` and updates the post's trending score."""
+    match = (table.c.user_id == user.id) & (table.c.post_id == post.id)
+    existing = db.execute(select(table.c.created_at).where(match)).first()
+    if existing is not None:
+        db.execute(delete(table).where(match))
+        trending.remove_interaction(post, weight, existing.created_at)
+    else:
+        now = datetime.datetime.utcnow()
+        db.execute(insert(table).values(user_id=user.id, post_id=post.id, created_at=now))
+        trending.add_interaction(post, weight, now)
+    db.commit()
+
 @router.post("/posts/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_permission(["like_post"]))])
 def toggle_post_like(post_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Toggles a like on a post for the current user."""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = db.query(Post).filter(Post.id == post_id).with_for_update().first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    if current_user in post.liked_by_users:
-        post.liked_by_users.remove(current_user)
-    else:
-        post.liked_by_users.append(current_user)
-        
-    db.commit()
+    _toggle_post_interaction(db, post_likes_association, post, current_user, trending.LIKE_WEIGHT)
 
 @router.post("/posts/{post_id}/bookmark", status_code=status.HTTP_204_NO_CONTENT)
 def toggle_post_bookmark(post_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Toggles a bookmark on a post for the current user."""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = db.query(Post).filter(Post.id == post_id).with_for_update().first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    if current_user in post.bookmarked_by_users:
-        post.bookmarked_by_users.remove(current_user)
-    else:
-        post.bookmarked_by_users.append(current_user)
-        
-    db.commit()
+    _toggle_post_interaction(db, post_bookmarks_association, post, current_user, trending.BOOKMARK_WEIGHT)
 
 @router.post("/users/{user_id}/favorite", status_code=status.HTTP_204_NO_CONTENT)
 def toggle_favorite_writer(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -1,7 +1,7 @@
 # schemas.py
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, List, Optional
 import datetime
 
 # --- MOVED: Define PostOwner before it is used in PostModel ---
@@ -36,14 +36,39 @@ class PostUpdate(BaseModel):
     status: Optional[str] = None
     pinned: Optional[bool] = None
 
+class TextEdit(BaseModel):
+    # Replaces body[start:end] with text (character offsets into the current body)
+    start: int
+    end: int
+    text: str = ""
+
+class JsonPatchOperation(BaseModel):
+    op: str
+    path: str
+    value: Optional[Any] = None
+
+class PostPatch(BaseModel):
+    version: int
+    edits: List[TextEdit] = []
+    operations: List[JsonPatchOperation] = []
+
+class PostVersion(BaseModel):
+    id: int
+    version: int
+    updated_at: datetime.datetime
+
 class PostModel(PostBase):
     id: int
+    version: int
     created_at: datetime.datetime
     updated_at: datetime.datetime
     owner: PostOwner # Now this works because PostOwner is defined above
     class Config:
         from_attributes = True
 
+class TrendingPostModel(PostModel):
+    score: float  # decayed like/bookmark score, in units of fresh likes
+
 # --- Pydantic Schemas for Groups ---
 
 class GroupBase(BaseModel):
@@ -0,0 +1,106 @@
+# trending.py
+#
+# Time-decayed "trending" score for posts.
+#
+# Every like/bookmark contributes weight * 2^(-age / HALF_LIFE). Rather than
+# decaying every post on every tick, each contribution is stored relative to a
+# fixed EPOCH as weight * exp(t / TAU); multiplying all scores by the same
+# exp(-now / TAU) never changes their order, so Post.trending_score can be
+# indexed and sorted directly. Scores are kept in log space so they do not
+# overflow as t grows.
+#
+# Run `python trending.py` to rebuild all scores from the association tables.
+
+import datetime
+import math
+import sys
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal, engine
+import upgrade_db
+
+HALF_LIFE_HOURS = 24
+TAU = HALF_LIFE_HOURS * 3600 / math.log(2)
+EPOCH = datetime.datetime(2024, 1, 1)
+
+LIKE_WEIGHT = 1.0
+BOOKMARK_WEIGHT = 2.0
+
+
+def _log_contribution(weight: float, at: datetime.datetime) -> float:
+    return math.log(weight) + (at - EPOCH).total_seconds() / TAU
+
+
+def add_interaction(post: models.Post, weight: float, at: datetime.datetime):
+    """Adds one like/bookmark made at `at` to the post's score."""
+    contribution = _log_contribution(weight, at)
+    post.trending_interactions = (post.trending_interactions or 0) + 1
+    if post.trending_score is None:
+        post.trending_score = contribution
+    else:
+        high, low = max(post.trending_score, contribution), min(post.trending_score, contribution)
+        post.trending_score = high + math.log1p(math.exp(low - high))
+
+
+def remove_interaction(post: models.Post, weight: float, at: Optional[datetime.datetime]):
+    """Removes a like/bookmark previously added with add_interaction."""
+    if post.trending_score is None or at is None:
+        return
+    post.trending_interactions = (post.trending_interactions or 0) - 1
+    if post.trending_interactions <= 0:
+        post.trending_interactions = 0
+        post.trending_score = None
+        return
+    delta = _log_contribution(weight, at) - post.trending_score
+    # Something is left, but it may be below double precision of the removed
+    # term; keep it at the smallest share we can represent rather than dropping it.
+    remaining = max(-math.expm1(delta), sys.float_info.epsilon)
+    post.trending_score += math.log(remaining)
+
+
+def decayed_score(post: models.Post, now: Optional[datetime.datetime] = None) -> float:
+    """The post's score as of `now`, in units of fresh likes."""
+    if post.trending_score is None:
+        return 0.0
+    now = now or datetime.datetime.utcnow()
+    return math.exp(post.trending_score - (now - EPOCH).total_seconds() / TAU)
+
+
+def rebuild_trending_scores(db: Session):
+    """Recomputes every post's score from post_likes and post_bookmarks."""
+    db.query(models.Post).update(
+        {models.Post.trending_score: None, models.Post.trending_interactions: 0},
+        synchronize_session=False,
+    )
+    posts = {}
+    sources = (
+        (models.post_likes_association, LIKE_WEIGHT),
+        (models.post_bookmarks_association, BOOKMARK_WEIGHT),
+    )
+    for table, weight in sources:
+        rows = db.execute(select(table.c.post_id, table.c.created_at)).all()
+        for post_id, created_at in rows:
+            if created_at is None:
+                continue
+            if post_id not in posts:
+                posts[post_id] = db.get(models.Post, post_id)
+            # SQLite does not enforce the foreign key, so the post may be gone.
+            if posts[post_id] is None:
+                continue
+            add_interaction(posts[post_id], weight, created_at)
+    db.commit()
+
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    upgrade_db.upgrade(engine)
+    db = SessionLocal()
+    try:
+        rebuild_trending_scores(db)
+        print("Trending scores rebuilt.")
+    finally:
+        db.close()
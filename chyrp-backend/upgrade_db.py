@@ -0,0 +1,53 @@
+# upgrade_db.py
+#
+# models.Base.metadata.create_all() only creates missing tables; it never adds
+# columns to tables that already exist. This adds the columns introduced after
+# the first release. Every step is skipped if the column is already there, so
+# it is safe to run on every startup (main.py does) or by hand:
+#   python upgrade_db.py
+
+from sqlalchemy import inspect, text
+
+from database import engine
+
+# (table, column, DDL statements that add it)
+UPGRADES = [
+    ("post_likes", "created_at", [
+        "ALTER TABLE post_likes ADD COLUMN created_at TIMESTAMP",
+    ]),
+    ("post_bookmarks", "created_at", [
+        "ALTER TABLE post_bookmarks ADD COLUMN created_at TIMESTAMP",
+    ]),
+    ("posts", "trending_score", [
+        "ALTER TABLE posts ADD COLUMN trending_score FLOAT",
+        "CREATE INDEX ix_posts_trending_score ON posts (trending_score)",
+    ]),
+    ("posts", "trending_interactions", [
+        "ALTER TABLE posts ADD COLUMN trending_interactions INTEGER DEFAULT 0 NOT NULL",
+        # Count what an existing trending_score was built from.
+        "UPDATE posts SET trending_interactions = "
+        "(SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id AND post_likes.created_at IS NOT NULL) + "
+        "(SELECT COUNT(*) FROM post_bookmarks WHERE post_bookmarks.post_id = posts.id AND post_bookmarks.created_at IS NOT NULL)",
+    ]),
+    ("posts", "version", [
+        "ALTER TABLE posts ADD COLUMN version INTEGER DEFAULT 1 NOT NULL",
+    ]),
+]
+
+
+def upgrade(bind=engine):
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as connection:
+        for table, column, statements in UPGRADES:
+            if table not in existing_tables:
+                continue
+            if column in {c["name"] for c in inspector.get_columns(table)}:
+                continue
+            print(f"Adding column {table}.{column}...")
+            for statement in statements:
+                connection.execute(text(statement))
+
+
+if __name__ == "__main__":
+    upgrade()